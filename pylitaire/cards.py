@@ -69,11 +69,21 @@ class TURN(enum23.Enum):
     FACEDOWN = False
 
 
+class KIND(enum23.Enum):
+    """Slot kinds, so game rules can tell slots apart."""
+    NONE       = 0
+    STOCK      = 1
+    WASTE      = 2
+    FOUNDATION = 3
+    TABLEAU    = 4
+    RESERVE    = 5  # Any other slot holding cards to play, like free cells
+
+
 class Deck(pygame.sprite.LayeredDirty):
     """Collection of Cards."""
 
     def __init__(self, theme=None):
-        super(Deck, self).__init__()
+        super().__init__()
 
         self.theme = theme
         if theme:
@@ -86,6 +96,8 @@ class Deck(pygame.sprite.LayeredDirty):
         # Set the cards
         self.cards = []
         self.cardsdict = {}
+        self.facedown = 0  # Number of cards faced down, kept by Card.flip()
+        self.changed = True  # Set by any card move, flip or shuffle, see Game.restart()
 
         # Animation-related
         self.animating = False
@@ -128,6 +140,7 @@ class Deck(pygame.sprite.LayeredDirty):
         self.empty()
         shuffle(self.cards)
         self.add(*self.cards)
+        self.changed = True
 
     def get_top_card(self, pos):
         cards = self.get_sprites_at(pos)
@@ -139,6 +152,8 @@ class Deck(pygame.sprite.LayeredDirty):
         self.remove(*self)
         self.cardsdict.clear()
         del self.cards[:]
+        self.facedown = 0
+        self.changed = True
         if doubledeck:
             decks = 2
         else:
@@ -152,6 +167,8 @@ class Deck(pygame.sprite.LayeredDirty):
                     self.add(card)
                     self.cards.append(card)
                     self.cardsdict[(rank, suit)] = card
+                    if not card.faceup:
+                        self.facedown += 1
 
     def pop_cards(self):
         """Break all stacks, pop()'ing each card."""
@@ -222,7 +239,7 @@ class Card(pygame.sprite.DirtySprite):
     def __init__(self, rank, suit, deck=None,
                  position=(0, 0), faceup=True, orientation=ORIENTATION.DOWN,
                  slot=None, card_id=""):
-        super(Card, self).__init__()
+        super().__init__()
 
         if card_id:
             card_id = card_id.upper()
@@ -376,6 +393,8 @@ class Card(pygame.sprite.DirtySprite):
     def move(self, pos):
         """Move the card to <pos>, a (x, y) tuple."""
         self.dirty = 1
+        if self.deck is not None:
+            self.deck.changed = True
         self.rect.topleft = pos
         self.deck.move_to_front(self)
 
@@ -393,6 +412,9 @@ class Card(pygame.sprite.DirtySprite):
             return
         if faceup == TURN.TOGGLE:
             faceup = not self._faceup
+        if self.deck is not None and bool(faceup) != bool(self._faceup):
+            self.deck.facedown += -1 if faceup else 1
+            self.deck.changed = True
         self._faceup = faceup
         if self._faceup:
             self.image = self.cardimage
@@ -460,8 +482,9 @@ class Card(pygame.sprite.DirtySprite):
         if not overlap:
             overlap = self.snap_overlap
         if orientation != ORIENTATION.NONE:
-            self.move((card.rect.x + orientation[0] * overlap[0] * card.rect.w,
-                       card.rect.y + orientation[1] * overlap[1] * card.rect.h))
+            x, y, w, h = card.rect
+            self.move((x + orientation[0] * overlap[0] * w,
+                       y + orientation[1] * overlap[1] * h))
         if self.child:
             self.child.snap(self, orientation, overlap)
 
@@ -491,7 +514,14 @@ class Card(pygame.sprite.DirtySprite):
         """
         # Could be merged with snap(), but for now that is a strictly graphical function,
         # with no logical assignments, and it's not (yet) the time to break that invariant
-        self.slot = slot
+        if slot is not self.slot:
+            if self.deck is not None:
+                self.deck.changed = True
+            if self.slot is not None:
+                self.slot.ncards -= 1
+            if slot is not None:
+                slot.ncards += 1
+            self.slot = slot
         if self.child:
             # noinspection PyProtectedMember
             self.child._set_slot(slot)
@@ -499,10 +529,12 @@ class Card(pygame.sprite.DirtySprite):
     @property
     def children(self):
         """List all descendants, in order, not including itself."""
-        if self.child:
-            return [self.child] + self.child.children
-        else:
-            return []
+        children = []
+        card = self.child
+        while card:
+            children.append(card)
+            card = card.child
+        return children
 
     @property
     def is_tail(self):
@@ -531,7 +563,8 @@ class Slot(pygame.sprite.DirtySprite):
         rank=-1,
         suit=-1,
         image=None,
-        name=""
+        name="",
+        kind=KIND.NONE
     ):
         """Create slot at position <cell>, a (cx, cy) tuple in game grid units logic units.
 
@@ -548,10 +581,14 @@ class Slot(pygame.sprite.DirtySprite):
         rank is RANK.ACE - 1 for foundation and RANK.KING + 1 for tableau.
 
         <image> is a pygame.Surface that can be used to draw() the slot.
+
+        <kind> is a KIND member for game rules to classify slots, such as foundation
+        or tableau, so they can tell slots apart without scanning lists of slots.
         """
-        super(Slot, self).__init__()
+        super().__init__()
 
         self.name = name
+        self.kind = kind
         self.rank = rank
         self.suit = suit
         self.cell = cell
@@ -560,6 +597,7 @@ class Slot(pygame.sprite.DirtySprite):
         self.board = None
 
         self.child = None  # Card instance, set by card on place()
+        self.ncards = 0  # Number of cards in slot, kept by cards on place() and stack()
         self.rect = pygame.Rect(position, size)
         self.image = image
         self.blockedby = None
@@ -647,6 +685,21 @@ class Slot(pygame.sprite.DirtySprite):
         else:
             card.stack(self.tail)
 
+    def stack_all(self, cards, faceup=TURN.SAME):
+        """Stack each card in <cards>, in order, to the slot, facing it <faceup>.
+
+        Same as stack() for each card, but stacking each card directly to the
+        previous one, instead of walking to the slot tail every time.
+        """
+        parent = self.tail
+        for card in cards:
+            if parent is None:
+                card.place(self)
+            else:
+                card.stack(parent)
+            card.flip(faceup)
+            parent = card
+
     def deal(self, slots, faceup=TURN.SAME):
         """Stack the slot tail card.
 
@@ -666,6 +719,17 @@ class Slot(pygame.sprite.DirtySprite):
             card.flip(faceup)
             slot.stack(card)
 
+    def deal_all(self, slot, faceup=TURN.SAME):
+        """Deal all cards to <slot>, facing them <faceup>. Return the number of cards.
+
+        Same as deal() until the slot is empty, but walking its cards only once,
+        in reverse order, instead of from the head to the tail on every card.
+        """
+        cards = self.cards
+        cards.reverse()
+        slot.stack_all(cards, faceup)
+        return len(cards)
+
     @property
     def is_empty(self):
         """Is the slot empty?"""
@@ -680,8 +744,13 @@ class Slot(pygame.sprite.DirtySprite):
     @property
     def tail(self):
         """Stack tip card (ie, topmost layer), if any."""
-        if self.child:
-            return self.cards[-1]
+        # Walk the stack instead of building the cards list, as this is used
+        # once per card when dealing, such as recycling the waste to stock
+        card = self.child
+        if card:
+            while card.child:
+                card = card.child
+        return card
     tip = tail
 
     @property
@@ -693,6 +762,16 @@ class Slot(pygame.sprite.DirtySprite):
             return []
 
 
+def get_slot_at(slots, pos):
+    """Return the first slot in <slots> at <pos>, a (x, y) tuple, if any.
+
+    All slots are tested in a single pygame call, instead of a collidepoint() loop.
+    """
+    i = pygame.Rect(pos, (1, 1)).collidelist(slots)
+    if i >= 0:
+        return slots[i]
+
+
 if __name__ == '__main__':
     # unit tests
 
@@ -2,18 +2,17 @@
 # Copyright (C) 2014 Rodrigo Silva (MestreLion) <linux@rodrigosilva.com>
 # License: GPLv3 or later, at your choice. See <http://www.gnu.org/licenses/gpl>
 
-"""Basic implementation of enum module for Python 2 and 3."""
+"""Basic implementation of enum module."""
 
 __all__ = ['Enum']  # not necessary as Enum is the only non-__*__ name
 
-import sys
 
 class _meta(type):
     @property
     def __members__(self):
         return {k: v for k, v in self.__dict__.items()
                 if  not k.startswith("_")
-                and not self._callable(getattr(self, k))}
+                and not callable(getattr(self, k))}
 
     def __iter__(self):
         """Yield members sorted by value, not declaration order."""
@@ -40,16 +39,6 @@ class _meta(type):
 
 
 class _base(object):
-    @staticmethod
-    def _callable(obj):
-        """Helper wrapper for callable() that works on Python 3.0 and 3.1."""
-        try:
-            return callable(obj)
-        except NameError:
-            # Python 3.0 and 3.1 has no callable()
-            # which is a tiny safer than hasattr approach
-            return hasattr(obj, "__call__")
-
     @classmethod
     def name(cls, value):
         """Fallback for getting a friendly member name.
@@ -78,19 +67,11 @@ class _base(object):
         return sorted(cls.__members__, key=cls.__members__.get)
 
 
-# Python 2
-if sys.version_info[0] < 3:
-    class Enum(_base):
-        """A basic implementation of Enums for Python 2."""
-        __metaclass__ = _meta
+class Enum(_base, metaclass=_meta):
+    """A basic implementation of Enums."""
 
-# Python 3
-else:
-    # Python 2 see Python 3 metaclass declaration as SyntaxError, hence exec()
-    exec('class Enum(_base, metaclass=_meta):'
-         '"""A basic implementation of Enums for Python 3."""')
 
-del sys, _base, _meta
+del _base, _meta
 
 
 if __name__ == '__main__':
@@ -100,7 +81,7 @@ if __name__ == '__main__':
         """Enum class example"""
 
         # Declaration order is irrelevant, sorting will always be by value
-        # Values can be any non-callable, and in Python 3 must be comparable
+        # Values can be any non-callable, and must be comparable
         # Bottom line: don't make an Enum of functions,
         # and don't mix numbers with strings
         BLACK    =  0
@@ -121,7 +102,7 @@ if __name__ == '__main__':
             if v == cls.WHITE: return "Delight"
 
             # Uses default name as fallback for members not listed above
-            return super(Color, cls).name(v)
+            return super().name(v)
 
         @classmethod
         def counterpart(cls, v):
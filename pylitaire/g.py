@@ -8,7 +8,8 @@ Globals are basically divided in 4 groups:
 
 - Constants:
     In UPPERCASE. Most are used only once, but they are better here than hardcoded in
-    some module, like the game FPS and or status bar height. All immutable and literal.
+    some module, like the game FPS and or status bar height. All immutable and literal,
+    annotated as Final so they can be treated as such by type checkers and compilers.
 
 - Paths:
     Defined here and set only once, so also in UPPERCASE.
@@ -49,23 +50,26 @@ log = logging.getLogger(__name__)
 start_time = time.time()  # for profiling
 
 # General
-VERSION = "1.0"
-APPNAME = 'pylitaire'
+VERSION:  't.Final' = "1.0"
+APPNAME:  't.Final' = 'pylitaire'
 
 # Paths
-GAMEDIR = os.path.abspath(os.path.dirname(__file__) or '.')
-DATADIR = os.path.join(GAMEDIR, 'data')
-CONFIGDIR = xdg.BaseDirectory.save_config_path(APPNAME)
-WINDOWFILE = os.path.join(CONFIGDIR, 'window.json')
-CONFIGFILE = os.path.join(CONFIGDIR, '{}.conf'.format(APPNAME))
+GAMEDIR:     't.Final' = os.path.abspath(os.path.dirname(__file__) or '.')
+DATADIR:     't.Final' = os.path.join(GAMEDIR, 'data')
+CONFIGDIR:   't.Final' = xdg.BaseDirectory.save_config_path(APPNAME)
+WINDOWFILE:  't.Final' = os.path.join(CONFIGDIR, 'window.json')
+CONFIGFILE:  't.Final' = os.path.join(CONFIGDIR, '{}.conf'.format(APPNAME))
+CACHEDIR:    't.Final' = os.path.join(xdg.BaseDirectory.xdg_cache_home, APPNAME)
+PROFILEFILE: 't.Final' = os.path.join(CACHEDIR, '{}.prof'.format(APPNAME))
 
 # Graphics
-FPS = 30
-BGCOLOR = (0, 80, 16)  # Dark green
-MARGIN = (20, 10)  # Board margin and minimum card padding
-SBHEIGHT = 25  # status bar height
-SBCOLOR = (242, 241, 240)  # status bar background color
-MIN_SIZE = (320, 192)  # Minimum windows size
+FPS:      't.Final' = 30
+BGCOLOR:  't.Final' = (0, 80, 16)  # Dark green
+MARGIN:   't.Final' = (20, 10)  # Board margin and minimum card padding
+SBHEIGHT: 't.Final' = 25  # status bar height
+SBCOLOR:  't.Final' = (242, 241, 240)  # status bar background color
+MIN_SIZE: 't.Final' = (320, 192)  # Minimum windows size
+MAXDIRTY: 't.Final' = 16  # Dirty rects per frame above which their union is updated
 
 background: t.Optional['graphics.Background'] = None
 slot:       t.Optional['graphics.Slot']       = None
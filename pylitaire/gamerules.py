@@ -10,6 +10,8 @@ Design notes:
 - Talks to GUI only via high-level events such as `click(card)`, `drop(card)`, etc
 """
 
+import collections
+import itertools
 import logging
 import random
 
@@ -17,6 +19,7 @@ from . import cards
 
 log = logging.getLogger(__name__)
 
+# Dict {slug: <class>} of all games, populated by Game subclasses on creation
 _games = {}
 
 
@@ -43,37 +46,21 @@ def get_next(game, reverse=False):
 
 
 def get_games():
-    if _games:
-        return _games
-
-    def list_classes(base):
-        for cls in base.__subclasses__():
-            _games[cls.__name__.lower()] = cls
-            list_classes(cls)
-    list_classes(Game)  # Root Base class
     return _games
 
 
-class Command(object):
-    def __init__(self, command, *args, **kwargs):
-        self.command = command
-        self.args    = args
-        self.kwargs  = kwargs
-
-    def execute(self):
-        self.command(*self.args, **self.kwargs)
+class Game(object):
+    """Base class for all game rules."""
+    __slots__ = ('grid', 'slots', 'deck', 'name', 'undocmds', 'seed', '_stockslot')
 
-    def __repr__(self):
-        args = list(map(str, self.args))
-        args.extend(("%s=%s" % (k, v) for k, v in self.kwargs.items()))
-        return "<%s.%s(%s)>" % (
-            getattr(self.command, '__self__', ''),
-            self.command.__name__,
-            ", ".join(args))
+    # Maximum number of undo entries kept. Older ones are silently discarded
+    maxundo = 256
 
+    def __init_subclass__(cls, **kwargs):
+        """Register every game, ie, any subclass, direct or not."""
+        super().__init_subclass__(**kwargs)
+        _games[cls.__name__.lower()] = cls
 
-class Game(object):
-    """Base class for all game rules."""
     def __init__(self):
         """Each of these attributes are required to exist in subclasses:
 
@@ -98,7 +85,7 @@ class Game(object):
 
             class SuperSolitaire(Game):
                 def __init__(self):
-                    super(SuperSolitaire, self).__init__()
+                    super().__init__()
                     self.name = "My Super Solitaire!"
                     self.grid = (2, 1)
                     self.stock = self.create_slot((0, 0))
@@ -107,13 +94,17 @@ class Game(object):
 
         See Klondike for a more realistic game, and Yukon for an example on
         how to subclass an existing game to create a variant.
+
+        Built-in games declare their attributes in `__slots__`. Games that do not
+        are still free to set any attributes, as they get an instance __dict__.
         """
         self.grid = (0, 0)
         self.slots = []
         self.deck = cards.Deck()
         self.name = self.__class__.__name__
-        self.undocmds = []
+        self.undocmds = collections.deque(maxlen=self.maxundo)
         self.seed = 0
+        self._stockslot = None  # slot reported by status(), set on restart()
 
     ###########################################################################
     # API methods already implemented, subclasses should leave alone
@@ -129,34 +120,45 @@ class Game(object):
         return self.seed
 
     def restart(self, nolog=False):
-        """Handle a Restart Game event. Break all stacks and run setup()."""
+        """Handle a Restart Game event. Break all stacks and run setup().
+
+        If no card was moved or flipped since the last setup(), as tracked by
+        `deck.changed`, the board is already as setup() would leave it and the
+        deal is skipped.
+        """
         if not nolog:
             log.info("Restart game")
-        self.undocmds = []
+        self.undocmds.clear()
+        if not self.deck.changed:
+            return
+        stock = (getattr(self, "stock", None)
+                 or self.slots[0] if self.slots else None)
+        self._stockslot = stock if isinstance(stock, cards.Slot) else None
         self.deck.pop_cards()
         self.setup()
+        self.deck.changed = False
 
     def get_top_item(self, pos):
         """Top item at <pos>, either card or slot, if any. Called by GUI engine."""
         card = self.deck.get_top_card(pos)
         if card:
             return card
-        for slot in self.slots:
-            if slot.rect.collidepoint(pos):
-                return slot
+        return cards.get_slot_at(self.slots, pos)
 
     def undoable(self):
         return bool(self.undocmds)
 
     def undo(self):
-        command = self.undocmds.pop()
-        if isinstance(command, Command):
-            log.debug("Executing undo: %s", command)
-            command.execute()
-        else:
-            for cmd in reversed(command):
-                log.debug("Executing undo: %s", cmd)
-                cmd.execute()
+        """Undo the last action. See add_undo() for the undo records format."""
+        record = self.undocmds.pop()
+        if isinstance(record, tuple):
+            record = (record,)
+        debug = log.isEnabledFor(logging.DEBUG)
+        for command, args in reversed(record):
+            if debug:
+                log.debug("Executing undo: %s.%s%s", getattr(command, '__self__', ''),
+                          command.__name__, args)
+            command(*args)
 
     def title(self):
         """Game Title for Statusbar."""
@@ -180,7 +182,7 @@ class Game(object):
 
         Return True if card state changed.
         """
-        if item not in self.slots:
+        if not isinstance(item, cards.Slot):
             item.flip()
             self.add_undo(item.flip)
             return True
@@ -203,7 +205,7 @@ class Game(object):
         """
         slot = card.slot  # assuming cards are always in a slot
 
-        if target in self.slots:
+        if isinstance(target, cards.Slot):
             card.place(target)
         else:
             card.stack(target)
@@ -231,20 +233,10 @@ class Game(object):
         according to game rules, as default behavior is very permissive and only meant
         as an initial, "no-brainer" filter.
         """
-        droplist = []
-        for target in targets:
-
-            # dropping to a slot
-            if target in self.slots:
-                if target.is_empty:
-                    droplist.append(target)
-
-            # dropping to card
-            else:
-                if target.is_tail:
-                    droplist.append(target)
-
-        return droplist
+        return [target for target in targets
+                if (target.is_empty      # dropping to a slot
+                    if isinstance(target, cards.Slot) else
+                    target.is_tail)]     # dropping to card
 
     def status(self):
         """Status message string that will be displayed for the game by GUI at intervals.
@@ -253,23 +245,23 @@ class Game(object):
                 "Stock left: <stock>  Redeals left: <redeals>"
 
         <stock> is the number of cards in `self.stock` slot,
-        or the first slot in `self.slots` if such slot exists.
+        or the first slot in `self.slots` if such slot exists, as looked up
+        once on restart().
         <redeals> is a game attribute, if it exists.
 
         Games can override or extend this method to better suit them.
         """
-        messages = []
-
-        stock = (getattr(self, "stock", None)
-                 or self.slots[0] if self.slots else None)
-        if isinstance(stock, cards.Slot):
-            messages.append("Stock left: %d" % len(self.slots[0].cards))
-
+        stock = self._stockslot
         redeals = getattr(self, "redeals", None)
-        if redeals is not None:
-            messages.append("Redeals left: %d" % redeals)
 
-        return "  ".join(messages)
+        if redeals is None:
+            if stock is None:
+                return ""
+            return "Stock left: %d" % stock.ncards
+
+        if stock is None:
+            return "Redeals left: %d" % redeals
+        return "Stock left: %d  Redeals left: %d" % (stock.ncards, redeals)
 
     def score(self):
         """Return the current game score.
@@ -284,7 +276,7 @@ class Game(object):
         try:
             for slot in foundations:
                 if slot in self.slots:
-                    score += len(slot.cards)
+                    score += slot.ncards
         except TypeError:
             pass
         return score
@@ -311,33 +303,67 @@ class Game(object):
         self.slots.append(slot)
         return slot
 
-    def add_undo(self, command, *args, **kwargs):
-        """Add a command to the undo list."""
-        self.undocmds.append(Command(command, *args, **kwargs))
+    def remove_slot(self, slot):
+        """Remove a game slot created by create_slot().
+
+        The slot itself is not destroyed, so it may still be used by the game,
+        but it will no longer be considered a game slot.
+        """
+        self.slots.remove(slot)
+
+    def add_undo(self, command, *args):
+        """Add a command to the undo list, discarding the oldest one if full.
+
+        Undo records are plain (command, args) tuples. A list of such tuples is
+        a compound record, undone at once in reverse order, and can be appended
+        directly to `self.undocmds`.
+        """
+        self.undocmds.append((command, args))
 
     def click_stock_waste(self, stock, waste, redeals=None, maxredeals=-1):
         """Handle click on stock, waste, and their cards."""
         pass
 
-    def double_click_to_foundations(self, item, foundations):
+    def recycle_waste(self, waste, stock):
+        """Deal all cards in <waste> back to <stock>, faced down.
+
+        Return the undo records as a list, suitable as a compound record.
+        """
+        dealt = waste.deal_all(stock, cards.TURN.FACEDOWN)
+        return [(stock.deal, (waste, cards.TURN.FACEUP))] * dealt
+
+    def double_click_to_foundations(self, item, foundations, bysuit=False):
         """Handle double-click on <item>.
 
         Stack it to a suitable foundation slot if card is draggable() from its location
         and droppable() to any foundation slot.
+
+        If <bysuit> is True, the foundation the usual rules point to is tried first:
+        an Ace on an empty slot, or a card on the one of same suit and previous rank.
+        droppable() still has the final say, and all foundations are tested if that
+        one is not accepted.
         """
         if (
-            item in self.slots
+            isinstance(item, cards.Slot)
             or item.slot in foundations
             or not self.draggable(item)
         ):
             return
 
-        targets = []
-        for slot in foundations:
-            if slot.is_empty:
-                targets.append(slot)
-            else:
-                targets.append(slot.tail)
+        if bysuit and item.is_tail:
+            suit, rank = item.suit, item.rank - 1
+            ace = item.rank == cards.RANK.ACE
+            for slot in foundations:
+                tail = slot.tail
+                if ace if tail is None else (tail.suit == suit and tail.rank == rank):
+                    target = tail or slot
+                    if self.droppable(item, [target]):
+                        self.drop(item, target)
+                        return True
+                    break
+
+        # Empty foundations are targets themselves, otherwise their tail card is
+        targets = [slot.tail or slot for slot in foundations]
 
         droplist = self.droppable(item, targets)
         if droplist:
@@ -346,130 +372,171 @@ class Game(object):
 
 
 class Klondike(Game):
+    __slots__ = ('stock', 'waste', 'foundations', 'tableau')
+
     def __init__(self, grid=()):
-        super(Klondike, self).__init__()
+        super().__init__()
 
         self.grid = grid or (7, 3.2)
 
-        self.stock = self.create_slot((0, 0), name="Stock")
-        self.waste = self.create_slot((1, 0), name="Waste")
+        self.stock = self.create_slot((0, 0), name="Stock", kind=cards.KIND.STOCK)
+        self.waste = self.create_slot((1, 0), name="Waste", kind=cards.KIND.WASTE)
 
         self.foundations = []
         for i in range(self.grid[0] - 4, self.grid[0]):
             self.foundations.append(self.create_slot(
-                (i, 0), name="Foundation %s" % (i-3)))
+                (i, 0), name="Foundation %s" % (i-3), kind=cards.KIND.FOUNDATION))
 
         self.tableau = []
         for i in range(self.grid[0]):
             self.tableau.append(self.create_slot((i, 1),
                                                  cards.ORIENTATION.DOWN,
-                                                 name="Tableau %s" % (i+1)))
+                                                 name="Tableau %s" % (i+1),
+                                                 kind=cards.KIND.TABLEAU))
 
         self.deck.create_cards(doubledeck=False, jokers=0, faceup=False)
 
     def setup(self):
-        super(Klondike, self).setup()
-
-        for card in self.deck.cards:
-            self.stock.stack(card)
-            card.flip(cards.TURN.FACEDOWN)
-
-        for i, __ in enumerate(self.tableau):
-            self.stock.deal(self.tableau[i],      cards.TURN.FACEUP)
-            self.stock.deal(self.tableau[i + 1:], cards.TURN.FACEDOWN)
+        super().setup()
+
+        # Same layout as stacking the whole deck on stock and then, for each
+        # tableau slot, dealing a card faced up to it and faced down to all
+        # slots after it. But instead of dealing from the stock tail, walk the
+        # deck once from its end, and stack the remaining cards on stock.
+        deckcards = self.deck.cards
+        tableau = self.tableau
+        size = len(tableau)
+        dealt = size * (size + 1) // 2
+        self.stock.stack_all(itertools.islice(deckcards, len(deckcards) - dealt),
+                             cards.TURN.FACEDOWN)
+
+        deck = reversed(deckcards)
+        tails = [None] * size
+        for i in range(size):
+            for j in range(i, size):
+                card = next(deck)
+                card.flip(cards.TURN.FACEUP if i == j else cards.TURN.FACEDOWN)
+                if tails[j] is None:
+                    card.place(tableau[j])
+                else:
+                    card.stack(tails[j])
+                tails[j] = card
 
     def click(self, item):
         undo = []
         # Slot
-        if item in self.slots:
+        if isinstance(item, cards.Slot):
             if item is self.stock:
-                while not self.waste.is_empty:
-                    self.waste.deal(self.stock, cards.TURN.FACEDOWN)
-                    undo.append(Command(self.stock.deal, self.waste,
-                                        cards.TURN.FACEUP))
-                self.undocmds.append(undo)
+                self.undocmds.append(self.recycle_waste(self.waste, self.stock))
                 return True
 
         # Card
         elif item.is_tail and not item.faceup:
             if item.slot is self.stock:
                 self.stock.deal(self.waste)
-                undo.append(Command(self.waste.deal, self.stock))
+                undo.append((self.waste.deal, (self.stock,)))
 
             item.flip()
-            undo.append(Command(item.flip))
+            undo.append((item.flip, ()))
             self.undocmds.append(undo)
             return True
 
     def doubleclick(self, item):
-        return self.double_click_to_foundations(item, self.foundations)
+        return self.double_click_to_foundations(item, self.foundations, bysuit=True)
 
     def droppable(self, card, targets):
-        targets = super(Klondike, self).droppable(card, targets)
+        # Base class filter is fused in this loop, see Game.droppable()
+        # Card attributes and lookups are bound once, as they are loop invariant
+        foundation, tableau = cards.KIND.FOUNDATION, cards.KIND.TABLEAU
+        rank, suit, color, tail = card.rank, card.suit, card.color, card.is_tail
+        ace, king = rank == cards.RANK.ACE, rank == cards.RANK.KING
         droplist = []
         for target in targets:
 
             # dropping to a slot
-            if target in self.slots:
-                if target in self.foundations:
-                    if card.is_tail and card.rank == cards.RANK.ACE:
+            if isinstance(target, cards.Slot):
+                if not target.is_empty:
+                    continue
+                kind = target.kind
+                if kind == foundation:
+                    if tail and ace:
                         droplist.append(target)
-                elif target in self.tableau:
-                    if card.rank == cards.RANK.KING:
+                elif kind == tableau:
+                    if king:
                         droplist.append(target)
+                continue
+
+            if not target.is_tail:
+                continue
 
             # dropping to card in foundation
-            elif target.slot in self.foundations:
+            kind = target.slot.kind
+            if kind == foundation:
                 if (
-                    card.is_tail
-                    and target.suit == card.suit
-                    and target.rank == card.rank - 1
+                    tail
+                    and target.suit == suit
+                    and target.rank == rank - 1
                 ):
                     droplist.append(target)
 
             # dropping to card in tableau
-            elif target.slot in self.tableau:
+            elif kind == tableau:
                 if (
                     target.faceup
-                    and target.color != card.color
-                    and target.rank == card.rank + 1
+                    and target.color != color
+                    and target.rank == rank + 1
                 ):
                     droplist.append(target)
 
         return droplist
 
     def status(self):
-        return "Cards to uncover: %d" % sum(1 if not c.faceup else 0
-                                            for c in self.deck)
+        return "Cards to uncover: %d" % self.deck.facedown
 
 
 class Win(Klondike):
+    __slots__ = ()
+
     def __init__(self, grid=()):
-        super(Win, self).__init__(grid or (7, 4))
-        self.slots.remove(self.stock)
-        self.slots.remove(self.waste)
+        super().__init__(grid or (7, 4))
+        self.remove_slot(self.stock)
+        self.remove_slot(self.waste)
 
     def setup(self):
-        super(Win, self).setup()
+        super().setup()
         for slot in self.tableau + [self.stock]:
             while not slot.is_empty:
                 slot.deal(self.foundations[0], cards.TURN.FACEUP)
 
 
 class Yukon(Klondike):
+    __slots__ = ()
+
     def __init__(self, grid=()):
-        super(Yukon, self).__init__(grid or (7, 4))
-        self.slots.remove(self.stock)
-        self.slots.remove(self.waste)
+        super().__init__(grid or (7, 4))
+        self.remove_slot(self.stock)
+        self.remove_slot(self.waste)
 
     def setup(self, i=1):
         """Parameterized to be variation-friendly.
 
         <i>: tableau column to start dealing extra cards
         """
-        super(Yukon, self).setup()
-        while not self.stock.is_empty:
-            self.stock.deal(self.tableau[i:], cards.TURN.FACEUP)
+        super().setup()
+
+        # Same as dealing rounds from the stock tail to tableau[i:] until the
+        # stock is empty, but walking the stock once and tracking the tails
+        tableau = self.tableau[i:]
+        tails = [slot.tail for slot in tableau]
+        size = len(tableau)
+        for c, card in enumerate(reversed(self.stock.cards)):
+            j = c % size
+            card.flip(cards.TURN.FACEUP)
+            if tails[j] is None:
+                card.place(tableau[j])
+            else:
+                card.stack(tails[j])
+            tails[j] = card
 
 
 class Pylitaire(Yukon):
@@ -477,81 +544,96 @@ class Pylitaire(Yukon):
 
     Allow any card to be dropped on an empty tableau slot, not only Kings
     """
+    __slots__ = ()
+
     def __init__(self):
-        super(Pylitaire, self).__init__()  # (8, 4)
+        super().__init__()  # (8, 4)
 
     def setup(self, i=1):
-        super(Pylitaire, self).setup()
+        super().setup()
 
     def droppable(self, card, targets):
-        droplist = super(Pylitaire, self).droppable(card, targets)
+        droplist = super().droppable(card, targets)
 
         droplist.extend(__ for __ in targets if
                         __ not in droplist and
-                        __ in self.tableau and
+                        isinstance(__, cards.Slot) and
+                        __.kind == cards.KIND.TABLEAU and
                         __.is_empty)
 
         return droplist
 
 
 class Backbone(Game):
+    __slots__ = ('redeals', 'stock', 'waste', 'foundations', 'tableau', 'backbone',
+                 'block', '_dealslots')
+
     def __init__(self):
-        super(Backbone, self).__init__()
+        super().__init__()
 
         self.grid = (8, 4)
         self.redeals = 1
 
-        self.stock = self.create_slot((5, 2), name="Stock")
-        self.waste = self.create_slot((6, 2), name="Waste")
+        self.stock = self.create_slot((5, 2), name="Stock", kind=cards.KIND.STOCK)
+        self.waste = self.create_slot((6, 2), name="Waste", kind=cards.KIND.WASTE)
 
         self.foundations = []
         for i in range(8):
             self.foundations.append(self.create_slot((4 + i % 4, i // 4),
-                                                     name="Foundation %s" % (i + 1)))
+                                                     name="Foundation %s" % (i + 1),
+                                                     kind=cards.KIND.FOUNDATION))
 
         self.tableau = []
         for i in range(8):
             self.tableau.append(self.create_slot((3 * (i // 4), i % 4),
-                                                 name="Tableau %s" % (i + 1)))
+                                                 name="Tableau %s" % (i + 1),
+                                                 kind=cards.KIND.TABLEAU))
 
         self.backbone = []
         for i in range(18):
             self.backbone.append(self.create_slot((1 + i // 9, 1.0 / 3 * (i % 9)),
-                                                  name="Backbone %s" % (i + 1)))
+                                                  name="Backbone %s" % (i + 1),
+                                                  kind=cards.KIND.RESERVE))
+
+        backbone = self.backbone
+        for i in range(len(backbone) - 1):
+            backbone[i].blockedby = backbone[i + 1]
 
-        for i, slot in enumerate(self.backbone[:-1]):
-            slot.blockedby = self.backbone[i+1]
+        self.block = self.create_slot((1.5, 3), name="Block", kind=cards.KIND.RESERVE)
+        for i in (8, 17):
+            backbone[i].blockedby = self.block
 
-        self.block = self.create_slot((1.5, 3), name="Block")
-        for i in [8, 17]:
-            self.backbone[i].blockedby = self.block
+        # Slots dealt a card on setup, in dealing order
+        self._dealslots = tuple(self.tableau + self.backbone + [self.block])
 
         self.deck.create_cards(doubledeck=True)
 
     def setup(self):
-        for card in self.deck.cards:
-            self.stock.stack(card)
-            card.flip(cards.TURN.FACEDOWN)
-
-        self.stock.deal(self.tableau + self.backbone + [self.block],
-                        cards.TURN.FACEUP)
+        # Same as stacking the whole deck on stock and dealing a card faced up
+        # to each slot, but taking the dealt cards straight from the deck end
+        deckcards = self.deck.cards
+        slots = self._dealslots
+        self.stock.stack_all(itertools.islice(deckcards, len(deckcards) - len(slots)),
+                             cards.TURN.FACEDOWN)
+        for slot, card in zip(slots, reversed(deckcards)):
+            card.flip(cards.TURN.FACEUP)
+            card.place(slot)
 
         self.redeals = 1
 
     def click(self, item):
-        undo = []
-
-        if item in self.slots:
+        if isinstance(item, cards.Slot):
             if item is self.stock and self.redeals > 0:
-                while not self.waste.is_empty:
-                    self.waste.deal(self.stock, cards.TURN.FACEDOWN)
-                    undo.append(Command(self.stock.deal, self.waste,
-                                        cards.TURN.FACEUP))
+                undo = self.recycle_waste(self.waste, self.stock)
                 self.redeals -= 1
 
                 def undo_redeals(_self):
                     _self.redeals += 1
-                undo.append(Command(undo_redeals, self))
+                undo.append((undo_redeals, (self,)))
+
+                # The whole recycle is a single compound undo record
+                self.undocmds.append(undo)
+                return True
 
         elif item.slot is self.stock:
             self.stock.deal(self.waste, cards.TURN.FACEUP)
@@ -559,47 +641,59 @@ class Backbone(Game):
             return True
 
     def doubleclick(self, item):
-        return self.double_click_to_foundations(item, self.foundations)
+        return self.double_click_to_foundations(item, self.foundations, bysuit=True)
 
     def draggable(self, card):
-        return not (card.slot is self.stock
-                    or card.slot in self.foundations
-                    or (card.slot in self.backbone
-                        and not card.slot.blockedby.is_empty))
+        slot = card.slot
+        if slot.kind in (cards.KIND.STOCK, cards.KIND.FOUNDATION):
+            return False
+        # Backbone slots are reserves blocked by the next one, or by the block.
+        # Other slots have no blocker.
+        blockedby = slot.blockedby
+        return blockedby is None or blockedby.is_empty
 
     def droppable(self, card, targets):
-        targets = super(Backbone, self).droppable(card, targets)
+        # Base class filter is fused in this loop, see Game.droppable()
+        # Card attributes and lookups are bound once, as they are loop invariant
+        foundation, tableau = cards.KIND.FOUNDATION, cards.KIND.TABLEAU
+        rank, suit, tail = card.rank, card.suit, card.is_tail
+        ace = rank == cards.RANK.ACE
+        toempty = (card.slot.kind != cards.KIND.RESERVE
+                   or rank == cards.RANK.KING)
         droplist = []
         for target in targets:
 
             # dropping to a slot
-            if target in self.slots:
-                if target in self.foundations:
-                    if card.is_tail and card.rank == cards.RANK.ACE:
+            if isinstance(target, cards.Slot):
+                if not target.is_empty:
+                    continue
+                kind = target.kind
+                if kind == foundation:
+                    if tail and ace:
                         droplist.append(target)
-                elif target in self.tableau:
-                    if (
-                        (card.slot not in self.backbone + [self.block])
-                        or card.rank == cards.RANK.KING
-                    ):
+                elif kind == tableau:
+                    if toempty:
                         droplist.append(target)
+                continue
+
+            if not target.is_tail:
+                continue
 
             # dropping to card in foundation
-            elif target.slot in self.foundations:
+            kind = target.slot.kind
+            if kind == foundation:
                 if (
-                    card.is_tail
-                    and target.is_tail
-                    and target.suit == card.suit
-                    and target.rank == card.rank - 1
+                    tail
+                    and target.suit == suit
+                    and target.rank == rank - 1
                 ):
                     droplist.append(target)
 
             # dropping to card in tableau
-            elif target.slot in self.tableau:
+            elif kind == tableau:
                 if (
-                    target.is_tail
-                    and target.suit == card.suit
-                    and target.rank == card.rank + 1
+                    target.suit == suit
+                    and target.rank == rank + 1
                 ):
                     droplist.append(target)
 
@@ -607,21 +701,20 @@ class Backbone(Game):
 
 
 class Test(Game):
+    __slots__ = ()
+
     def __init__(self):
-        super(Test, self).__init__()
+        super().__init__()
         self.grid = (3, 3)
         self.deck.create_cards()
-        for i in range(self.grid[0]):
-            for j in range(self.grid[1] - 1):
-                slot = self.create_slot((i, j))
-                if j == 1:
-                    slot.orientation = cards.ORIENTATION.DOWN
+        for i, j in itertools.product(range(self.grid[0]), range(self.grid[1] - 1)):
+            slot = self.create_slot((i, j))
+            if j == 1:
+                slot.orientation = cards.ORIENTATION.DOWN
 
     def setup(self):
         slot = self.slots[1]
-        for card in self.deck.cards:
-            slot.stack(card)
-            card.flip(cards.TURN.FACEUP)
+        slot.stack_all(self.deck.cards, cards.TURN.FACEUP)
         slot.fit()
 
     def click(self, item):
@@ -632,16 +725,21 @@ class Test(Game):
 
 
 class Exapunks(Game):
+    __slots__ = ('_score', 'pocket', 'tableau')
+
     def __init__(self):
-        super(Exapunks, self).__init__()
+        super().__init__()
         self._score = 0
         self.grid = (9, 3.2)
-        self.pocket = self.create_slot((self.grid[0] - 1.5, 0), name="Pocket")
+        self.pocket = self.create_slot((self.grid[0] - 1.5, 0),
+                                       name="Pocket",
+                                       kind=cards.KIND.RESERVE)
         self.tableau = []
         for i in range(self.grid[0]):
             self.tableau.append(self.create_slot((i, 1),
                                                  cards.ORIENTATION.DOWN,
-                                                 name="Tableau %s" % (i+1)))
+                                                 name="Tableau %s" % (i+1),
+                                                 kind=cards.KIND.TABLEAU))
 
         def cardfilter(card):
             return card.rank == cards.RANK.ACE or card.rank >= 6
@@ -649,9 +747,7 @@ class Exapunks(Game):
 
     def setup(self):
         self._score = 0
-        for card in self.deck.cards:
-            self.pocket.stack(card)
-            card.flip(cards.TURN.FACEUP)
+        self.pocket.stack_all(self.deck.cards, cards.TURN.FACEUP)
 
         for _ in range(4):
             self.pocket.deal(self.tableau)
@@ -680,19 +776,22 @@ class Exapunks(Game):
         )
 
     def droppable(self, card, targets):
-        targets = super(Exapunks, self).droppable(card, targets)
+        targets = super().droppable(card, targets)
         droplist = []
         for target in targets:
-            # dropping to pocket
-            if target is self.pocket and card.is_tail:
-                droplist.append(target)
+            if isinstance(target, cards.Slot):
+                kind = target.kind
 
-            # dropping to tableau
-            elif target in self.tableau:
-                droplist.append(target)
+                # dropping to pocket
+                if kind == cards.KIND.RESERVE and card.is_tail:
+                    droplist.append(target)
+
+                # dropping to tableau
+                elif kind == cards.KIND.TABLEAU:
+                    droplist.append(target)
 
             # dropping to card in tableau
-            elif target.slot in self.tableau and self.is_match(card, target):
+            elif target.slot.kind == cards.KIND.TABLEAU and self.is_match(card, target):
                 droplist.append(target)
 
         return droplist
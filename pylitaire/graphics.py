@@ -4,24 +4,28 @@
 
 """Graphics-related functions."""
 
-import math
+import functools
+import hashlib
 import logging
 import os
 import sys
+import typing as t
+import urllib.parse
 
 # Disable Pygame advertisement. Must be done before importing pygame
 # https://github.com/pygame/pygame/commit/18a31449de93866b369893057f1e60330b53da95
 os.environ['PYGAME_HIDE_SUPPORT_PROMPT'] = ""  # the key just need to exist
 import pygame
-import cairo
-import PIL.Image
-import gi
-gi.require_version('Rsvg', '2.0')
-from gi.repository import Rsvg
 
 from . import g
 from . import cursors
 
+# Cairo and Rsvg (via PyGObject) are heavy imports only needed for vector images,
+# and PIL only for old Pygame versions, so they are imported on first use.
+# See svglibs() and render_vector()
+if t.TYPE_CHECKING:
+    from gi.repository import Rsvg
+
 log = logging.getLogger(__name__)
 
 # File extensions of pygame supported image formats
@@ -29,10 +33,24 @@ log = logging.getLogger(__name__)
 IMAGE_EXTS = ['jpg', 'jpeg', 'png', 'gif', 'bmp', 'pcx', 'tga', 'tif', 'tiff',
               'lbm', 'pbm', 'pgm', 'ppm', 'xpm']
 
+# Location and maximum number of files of the on-disk SVG render cache
+RASTER_CACHE_DIR = os.path.join(g.CACHEDIR, 'render')
+RASTER_CACHE_FILES = 16
+
+# pygame.image.frombuffer() accepts "BGRA" since Pygame 2.1.3
+BGRA_BUFFER = pygame.version.vernum >= (2, 1, 3)
+
 _desktop_size = ()
 
+# Latest render of each SVG file not yet in the on-disk cache, by file URI, as
+# (cachefile, surface). Written by save_raster_cache(), off the resize path
+_raster_pending: t.Dict[str, t.Tuple[str, pygame.Surface]] = {}
+
 
 class Background(object):
+    # Number of rendered sizes kept, such as windowed and full screen
+    cachesize = 2
+
     def __init__(self, path="", size=(), color=None, title=""):
         """Create a new background of <size> from a <path> image file.
 
@@ -46,40 +64,60 @@ class Background(object):
         self.color = color or g.BGCOLOR
         self.original = None
         self.surface = None
+        self._rendered = {}  # size: clean rendered surface, see resize()
 
         if size:
             self.resize(size)
 
     def resize(self, size):
-        """Return surface of <size> rendered with original background image.
+        """Set surface to <size>, rendered with original background image.
 
         If original image is smaller than (800, 600) then tile it (repeat),
         otherwise re-scale to fit (stretch/shrink).
+
+        The last few rendered sizes are cached, so resizing back to one of them,
+        or to the current size to clear the surface, is just a copy.
         """
-        self.surface = pygame.Surface(size)
+        size = tuple(size)
+        rendered = self._rendered.get(size)
+        if rendered is None:
+            rendered = self.render(size)
+            if len(self._rendered) >= self.cachesize:
+                del self._rendered[next(iter(self._rendered))]
+            self._rendered[size] = rendered
+        self.surface = rendered.copy()
+
+    def render(self, size):
+        """Return a new surface of <size> rendered with original background image."""
+        surface = pygame.Surface(size)
 
         if not self.original and self.path:
-            self.original = load_image(self.path).convert()
+            self.original = load_image(self.path, alpha=False)
 
         if not self.original:
             # No suitable background file found. Use a solid color fill
-            self.surface.fill(self.color)
-            return
+            surface.fill(self.color)
+            return surface
 
         bgw, bgh = self.original.get_size()
 
         if bgw >= 800 and bgh >= 600:
-            # Scale
-            pygame.transform.smoothscale(self.original, size, self.surface)
+            # Scale, unless already at the requested size
+            if size == (bgw, bgh):
+                surface.blit(self.original, (0, 0))
+            else:
+                pygame.transform.smoothscale(self.original, size, surface)
         else:
-            # Tile
-            for i in range(int(math.ceil(float(size[0]) / bgw))):
-                for j in range(int(math.ceil(float(size[1]) / bgh))):
-                    self.surface.blit(self.original, (i * bgw, j * bgh))
+            # Tile, all in a single blits() call
+            surface.blits([(self.original, (x, y))
+                           for x in range(0, size[0], bgw)
+                           for y in range(0, size[1], bgh)],
+                          doreturn=False)
 
         # Status bar area
         rect = pygame.Rect(0, size[1] - g.SBHEIGHT, size[0], g.SBHEIGHT)
-        self.surface.fill(g.SBCOLOR, rect)
+        surface.fill(g.SBCOLOR, rect)
+        return surface
 
     def draw(self, destsurface, position=()):
         """Draw the background to a destination <surface> at <position>.
@@ -92,16 +130,27 @@ class Background(object):
 class Slot(object):
     """Slot image."""
 
+    # Number of rendered sizes kept, see Background
+    cachesize = 2
+
     def __init__(self, path="", size=()):
         self.path = path or find_image(g.datadirs('images'), g.slotname, ['svg', 'svgz'])
         self.original = load_vector(self.path)
         self.surface = None
+        self._rendered = {}  # size: rendered surface
 
         if size:
             self.resize(size)
 
     def resize(self, size=()):
-        self.surface = render_vector(self.original, size, proportional=False)
+        size = tuple(size)
+        surface = self._rendered.get(size)
+        if surface is None:
+            surface = render_vector(self.original, size, proportional=False)
+            if len(self._rendered) >= self.cachesize:
+                del self._rendered[next(iter(self._rendered))]
+            self._rendered[size] = surface
+        self.surface = surface
 
 
 def init_graphics(window_size=None, full_screen=None):
@@ -220,7 +269,8 @@ def scale_size(original, size=(), proportional=True, multiple=(1, 1)):
     return round_to_multiple((result.width, result.height), multiple)
 
 
-def load_image(path, size=(), proportional=True, multiple=(1, 1)) -> pygame.Surface:
+def load_image(path, size=(), proportional=True, multiple=(1, 1),
+               alpha=True) -> pygame.Surface:
     """Wrapper for pygame.image.load, adding support for SVG images.
 
     As of SDL_image 2.0.2, Pygame 2.0.1 supports SVG on pygame.image.load(), but:
@@ -232,53 +282,86 @@ def load_image(path, size=(), proportional=True, multiple=(1, 1)) -> pygame.Surf
 
     For regular images, requesting a <size> different from the original (after
     processing aspect, multiple and roundings) will use pygame.transform.smoothscale().
+
+    If not <alpha>, the image is meant to be opaque, such as a background, and is
+    converted to the display format without per-pixel alpha.
     """
     if os.path.splitext(path.lower())[1] == ".svg":
-        return load_svg(path, size, proportional, multiple)
+        return load_svg(path, size, proportional, multiple, alpha=alpha)
 
     image = pygame.image.load(path)
 
     size = scale_size(image.get_size(), size, proportional, multiple)
     if size == image.get_size():
-        return image
+        return image if alpha else image.convert()
 
     # transform.smoothscale() requires a 24 or 32-bit image, so...
     if image.get_bitsize() not in [24, 32]:
         image = image.convert_alpha()
 
-    return pygame.transform.smoothscale(image, size)
+    image = pygame.transform.smoothscale(image, size)
+    return image if alpha else image.convert()
 
 
-def load_svg(path, *scaleargs, **scalekwargs) -> pygame.Surface:
+def load_svg(path, *scaleargs, alpha=True, **scalekwargs) -> pygame.Surface:
     """Load an SVG file, render to a new pygame surface and return the surface.
 
-    See scale_size() for documentation on scale arguments.
+    See scale_size() for documentation on scale arguments, render_vector() for <alpha>.
     """
     # noinspection PyArgumentList
-    return render_vector(load_vector(path), *scaleargs, **scalekwargs)
+    return render_vector(load_vector(path), *scaleargs, alpha=alpha, **scalekwargs)
+
+
+@functools.lru_cache(maxsize=None)
+def svglibs():
+    """Import the SVG rendering libraries on first use and return (cairo, Rsvg)."""
+    import cairo
+    import gi
+    gi.require_version('Rsvg', '2.0')
+    from gi.repository import Rsvg
+    return cairo, Rsvg
 
 
-def load_vector(path) -> Rsvg.Handle:
+def load_vector(path) -> 'Rsvg.Handle':
     """Load an SVG file from <path> and return a vector image object."""
     # noinspection PyArgumentList
-    return Rsvg.Handle.new_from_file(path)
+    return svglibs()[1].Handle.new_from_file(path)
 
 
-def get_vector_size(svg: Rsvg.Handle) -> tuple:
+def get_vector_size(svg: 'Rsvg.Handle') -> tuple:
     """Return the nominal (width, height) of a vector image object."""
     return svg.props.width, svg.props.height
 
 
-def render_vector(svg: Rsvg.Handle, *scaleargs, **scalekwargs) -> pygame.Surface:
+def render_vector(svg: 'Rsvg.Handle', *scaleargs, alpha=True,
+                  **scalekwargs) -> pygame.Surface:
     """Render a vector image to a new pygame surface and return that surface.
 
     Vector image objects are such as the one returned from load_vector(),
     currently an Rsvg.Handle.
+
+    If not <alpha>, the surface is converted to the display format without
+    per-pixel alpha, for opaque images.
     """
     # Calculate size
     svgsize = get_vector_size(svg)
     size = scale_size(svgsize, *scaleargs, **scalekwargs)
 
+    # Use a previous render of the same file and size, if any
+    cachefile = raster_cache_file(svg, size)
+    if cachefile and os.path.exists(cachefile):
+        try:
+            image = pygame.image.load(cachefile)
+        except (OSError, pygame.error) as e:
+            log.warning("Ignoring SVG render cache %s: %s", cachefile, e)
+        else:
+            log.debug("Loading SVG size (%4g,%4g) from cache: %s", *size, cachefile)
+            try:
+                os.utime(cachefile)  # Mark as recently used, see save_raster_cache()
+            except OSError:
+                pass
+            return image.convert_alpha() if alpha else image.convert()
+
     # If new size is different from original, calculate the scale factor
     scale = (1, 1)
     if not size == svgsize:
@@ -289,6 +372,7 @@ def render_vector(svg: Rsvg.Handle, *scaleargs, **scalekwargs) -> pygame.Surface
 
     # Create a Cairo surface.
     # Nominally ARGB, but in little-endian architectures it is effectively BGRA
+    cairo = svglibs()[0]
     surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, *size)
 
     # Create a context and scale it
@@ -303,12 +387,79 @@ def render_vector(svg: Rsvg.Handle, *scaleargs, **scalekwargs) -> pygame.Surface
 
     # Get image data buffer
     data = surface.get_data()
+    fmt = "RGBA"
     if sys.byteorder == 'little':
-        # Convert from effective BGRA to actual RGBA.
-        data = PIL.Image.frombuffer('RGBA', size, data.tobytes(),
-                                    'raw', 'BGRA', 0, 1).tobytes()
+        if BGRA_BUFFER:
+            # Read the buffer as is, convert_alpha() makes the pixel copy
+            fmt = "BGRA"
+        else:
+            # Convert from effective BGRA to actual RGBA.
+            import PIL.Image
+            data = PIL.Image.frombuffer('RGBA', size, data.tobytes(),
+                                        'raw', 'BGRA', 0, 1).tobytes()
+
+    image = pygame.image.frombuffer(data, size, fmt)
+    image = image.convert_alpha() if alpha else image.convert()
+    if cachefile:
+        # Only the latest size is worth saving, as it is the one in use
+        _raster_pending[svg.props.base_uri] = (cachefile, image)
+    return image
+
 
-    return pygame.image.frombuffer(data, size, "RGBA").convert_alpha()
+def raster_cache_file(svg: 'Rsvg.Handle', size):
+    """Return the path of the on-disk cache of <svg> rendered at <size>, if possible.
+
+    Cache files are named after a hash of the SVG file contents, so edited or
+    replaced files are rendered again. Only vector images loaded from files,
+    such as by load_vector(), can be cached.
+    """
+    uri = svg.props.base_uri
+    if not uri or not uri.startswith('file://'):
+        return None
+    try:
+        digest = file_digest(urllib.parse.unquote(urllib.parse.urlparse(uri).path))
+    except OSError:
+        return None
+    return os.path.join(RASTER_CACHE_DIR, "%s_%dx%d.png" % (digest, *size))
+
+
+def save_raster_cache():
+    """Save pending SVG renders to the on-disk cache as PNG, atomically.
+
+    Meant to be called on exit, as encoding is too slow for the resize path.
+    Least recently used files are removed to keep up to RASTER_CACHE_FILES.
+    Errors are logged.
+    """
+    if not _raster_pending:
+        return
+    cachedir = RASTER_CACHE_DIR
+    for cachefile, image in _raster_pending.values():
+        try:
+            os.makedirs(cachedir, exist_ok=True)
+            tempfile = cachefile + '.tmp'
+            with open(tempfile, 'wb') as fd:
+                pygame.image.save(image, fd, 'png')
+            os.replace(tempfile, cachefile)
+        except (OSError, pygame.error) as e:
+            log.warning("Could not save SVG render cache %s: %s", cachefile, e)
+    _raster_pending.clear()
+
+    try:
+        paths = [os.path.join(cachedir, _) for _ in os.listdir(cachedir)
+                 if _.endswith('.png')]
+        if len(paths) > RASTER_CACHE_FILES:
+            paths.sort(key=os.path.getmtime)
+            for path in paths[:-RASTER_CACHE_FILES]:
+                os.remove(path)
+    except OSError as e:
+        log.warning("Could not prune SVG render cache %s: %s", cachedir, e)
+
+
+@functools.lru_cache(maxsize=None)
+def file_digest(path):
+    """Return a short hash of the contents of the file at <path>, read only once."""
+    with open(path, 'rb') as fd:
+        return hashlib.sha1(fd.read()).hexdigest()[:16]
 
 
 def find_image(dirs, title="", exts=()):
@@ -316,15 +467,15 @@ def find_image(dirs, title="", exts=()):
 
     "Suitable" means being a supported image file, its extension in <exts>, and,
     if <title>, with file title (basename sans extension) matching it.
+
+    Directory listings are cached, see list_images().
     """
     for path in dirs:
         try:
-            for basename in os.listdir(path):
-                filetitle, ext = os.path.splitext(basename.lower())
+            for filetitle, ext, basename in list_images(path):
                 if (
                     (not title or title == filetitle) and
-                    (not exts or ext[1:] in exts) and
-                    (ext[1:] in IMAGE_EXTS+['svg'])
+                    (not exts or ext in exts)
                 ):
                     return os.path.join(path, basename)
         except OSError as e:
@@ -333,3 +484,18 @@ def find_image(dirs, title="", exts=()):
                 continue
             else:
                 raise
+
+
+@functools.lru_cache(maxsize=None)
+def list_images(path):
+    """Return a tuple of (title, extension, basename) of supported image files in <path>.
+
+    Title and extension are lowercase, extension without the leading dot.
+    Results are cached, call list_images.cache_clear() if directories change.
+    """
+    images = []
+    for basename in os.listdir(path):
+        filetitle, ext = os.path.splitext(basename.lower())
+        if ext[1:] in IMAGE_EXTS + ['svg']:
+            images.append((filetitle, ext[1:], basename))
+    return tuple(images)
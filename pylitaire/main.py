@@ -17,7 +17,9 @@
 
 """Main module and entry point."""
 
+import cProfile
 import logging
+import os
 import sys
 
 from . import g
@@ -44,7 +46,15 @@ def main(args=None):
     themes.init_themes(g.datadirs('themes') + ['/usr/share/aisleriot/cards'])
 
     gui = ui.Gui()
-    gui.run(g.window_size, g.full_screen, g.gamename)
+    if g.profile:
+        # Stats for the whole load and first frame, viewable with snakeviz
+        profiler = cProfile.Profile()
+        profiler.runcall(gui.run, g.window_size, g.full_screen, g.gamename)
+        os.makedirs(os.path.dirname(g.PROFILEFILE), exist_ok=True)
+        profiler.dump_stats(g.PROFILEFILE)
+        log.info("Profile stats saved to %s", g.PROFILEFILE)
+    else:
+        gui.run(g.window_size, g.full_screen, g.gamename)
 
     g.save_options()
     if g.profile:
@@ -27,11 +27,15 @@ class Theme(object):
     """Each cards theme."""
     _re_id = re.compile(r'''[- '"]''')
 
+    # Number of rendered sizes kept, see graphics.Background
+    cachesize = 2
+
     def __init__(self, themeid, path, name=""):
         self.id = themeid
         self.path = path
         self.name = name or self.id.replace("_", " ").title()
         self._image = None
+        self._rendered = {}  # (cardsize, proportional): rendered surface
         self.size = ()
 
     @property
@@ -48,10 +52,22 @@ class Theme(object):
         return (self.image.props.height / 5.) / (self.image.props.width / 13.)
 
     def render(self, cardsize=(), proportional=True):
-        """Render the theme image into a pygame surface and return it."""
-        size = cardsize and (cardsize[0] * 13,
-                             cardsize[1] *  5)
-        return graphics.render_vector(self.image, size, proportional, multiple=(13, 5))
+        """Render the theme image into a pygame surface and return it.
+
+        The last few renders are cached, so the same surface may be returned for
+        the same arguments. It should not be drawn on.
+        """
+        key = (tuple(cardsize), proportional)
+        surface = self._rendered.get(key)
+        if surface is None:
+            size = cardsize and (cardsize[0] * 13,
+                                 cardsize[1] *  5)
+            surface = graphics.render_vector(self.image, size, proportional,
+                                             multiple=(13, 5))
+            if len(self._rendered) >= self.cachesize:
+                del self._rendered[next(iter(self._rendered))]
+            self._rendered[key] = surface
+        return surface
 
     @classmethod
     def name_to_id(cls, name):
@@ -74,6 +74,7 @@ class Gui(object):
         self.clear = False
         self.board = None
         self.fullboard = None
+        self.maxdirty = g.MAXDIRTY
 
         self.games = gamerules.get_games()
         self.statusbar = StatusBar(height=g.SBHEIGHT, bgcolor=g.SBCOLOR)
@@ -107,6 +108,7 @@ class Gui(object):
 
                 clock.tick(g.FPS * (3 if self.win else 1))
         finally:
+            graphics.save_raster_cache()
             pygame.quit()
 
     def load_game(self, gamename):
@@ -133,13 +135,27 @@ class Gui(object):
         Return True if game should keep running.
         """
         self.ticks = pygame.time.get_ticks()
+        mousemotion = pygame.MOUSEMOTION
+        mousebuttons = (pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP)
+        moved = False
         for event in pygame.event.get():
-            if event.type in [pygame.MOUSEMOTION,
-                              pygame.MOUSEBUTTONDOWN,
-                              pygame.MOUSEBUTTONUP]:
+            etype = event.type
+            # Mouse motion events come in bursts and only the last position matters,
+            # so look up the card under mouse just once, before any other event
+            # or at the end. _handle_event() has nothing to do for motion.
+            if etype == mousemotion:
                 self.pos = event.pos
+                moved = True
+                continue
+            if etype in mousebuttons:
+                self.pos = event.pos
+                moved = True
+            if moved:
                 self._update_card(updatestatus=False)
+                moved = False
             self._handle_event(event, self.game)
+        if moved:
+            self._update_card(updatestatus=False)
 
     def _update_card(self, force_cursor_update=False, updatestatus=True):
         """Get the (possibly new) card under mouse position.
@@ -345,7 +361,9 @@ class Gui(object):
             if self.game.win():
                 self.wingame()
 
-        self.game.deck.update()
+        # Cards only change on their own while the win animation is running
+        if self.game.deck.animating:
+            self.game.deck.update()
         for sprite in self.widgets:
             if sprite.need_update:
                 sprite.update()
@@ -363,16 +381,25 @@ class Gui(object):
                 self.set_mouse_cursor('default')
 
     def draw(self):
-        dirty = []
+        """Draw all sprites and return the list of rects to update on display.
 
+        Many small rects, such as when dragging a stack over other cards, are merged
+        into their bounding rect, so display update handles a single one.
+        """
         if self.clear:
             g.background.draw(self.window)
-            dirty = [self.window.get_rect()]
+            for group in self.spritegroups:
+                group.draw(self.window)
+            self.clear = False
+            # Whole window is updated, no need for sprites' rects
+            return [self.window.get_rect()]
 
+        dirty = []
         for group in self.spritegroups:
             dirty.extend(group.draw(self.window))
 
-        self.clear = False
+        if len(dirty) > self.maxdirty:
+            return [dirty[0].unionall(dirty[1:])]
         return dirty
 
     def set_mouse_cursor(self, cursorname):
@@ -384,6 +411,15 @@ class Gui(object):
     def resize(self, window_size=None, full_screen=None):
         """Resize all widgets according to new window <size>, triggering board resize."""
 
+        # Window managers may report the last requested size again, for example
+        # on restore or after a redundant set_mode(), and a full relayout would
+        # re-render every card and slot for nothing. Compare with the requested
+        # size, as pygame already resizes the display surface before the event.
+        if (self.window is not None and full_screen in (None, g.full_screen)
+                and window_size is not None
+                and tuple(window_size) == tuple(g.window_size)):
+            return
+
         self.window = graphics.resize(window_size, full_screen)
         size = self.window.get_size()
         if size[0] < g.MIN_SIZE[0] or size[1] < g.MIN_SIZE[1]:
@@ -410,7 +446,7 @@ class Gui(object):
         - slot image, by its own .resize(cardsize).
         - `game.slots`, by its own .resize(cardsize).
         - Reposition of `game.slots` and its cards via .board_move().
-        - As a handy hack, draw slots as background.
+        - As a handy hack, draw slots as background, batched in a single blits().
         """
         if not self.game:
             return
@@ -465,11 +501,15 @@ class Gui(object):
 
         g.slot.resize(cardsize)
         geometry = pygame.Rect(self.board.topleft, cellsize)
+        slotblits = []
         for slot in self.game.slots:
             slot.resize(cardsize)
             slot.boardmove(geometry)
             slot.fit(board)
-            slot.draw(g.background.surface, g.slot.surface)
+            slot.image = g.slot.surface
+            slotblits.append((slot.image, slot.rect))
+        # Draw all slots onto background in a single call
+        g.background.surface.blits(slotblits, doreturn=False)
 
         if self.win:
             self.game.deck.board = fullboard
@@ -516,7 +556,7 @@ class StatusBar(pygame.sprite.DirtySprite):
         font_name       = params.pop('font_name',  None)
         font_size       = params.pop('font_size',  24)
         width, height   = params.pop('windowsize', (0, 0))
-        super(StatusBar, self).__init__()
+        super().__init__()
 
         self.font = font or pygame.font.Font(font_name, font_size)
 